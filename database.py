@@ -6,10 +6,11 @@ Import and use these functions in your API endpoints for database operations.
 """
 
 from pymongo import MongoClient
+from bson import ObjectId
 from datetime import datetime, timezone
 import os
 from dotenv import load_dotenv
-from typing import Union
+from typing import List, Union
 from pydantic import BaseModel
 
 # Load environment variables from .env file
@@ -26,30 +27,50 @@ if database_url and database_name:
     db = _client[database_name]
 
 # Helper functions for common database operations
+def _to_document(data: Union[BaseModel, dict], now: datetime) -> dict:
+    """Convert a Pydantic model (v2 model_dump) or dict to a timestamped Mongo document"""
+    # Python mode on purpose: mode="json" would store datetimes as strings instead of BSON dates
+    data_dict = data.model_dump() if isinstance(data, BaseModel) else data.copy()
+    data_dict['created_at'] = now
+    data_dict['updated_at'] = now
+    return data_dict
+
 def create_document(collection_name: str, data: Union[BaseModel, dict]):
     """Insert a single document with timestamp"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
 
-    # Convert Pydantic model to dict if needed
-    if isinstance(data, BaseModel):
-        data_dict = data.model_dump()
-    else:
-        data_dict = data.copy()
+    result = db[collection_name].insert_one(_to_document(data, datetime.now(timezone.utc)))
+    return str(result.inserted_id)
 
-    data_dict['created_at'] = datetime.now(timezone.utc)
-    data_dict['updated_at'] = datetime.now(timezone.utc)
+def create_documents(collection_name: str, data: List[Union[BaseModel, dict]]) -> List[str]:
+    """Insert several documents with timestamps in a single round-trip"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
 
-    result = db[collection_name].insert_one(data_dict)
-    return str(result.inserted_id)
+    if not data:
+        return []
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
-    """Get documents from collection"""
+    now = datetime.now(timezone.utc)
+    result = db[collection_name].insert_many([_to_document(item, now) for item in data])
+    return [str(_id) for _id in result.inserted_ids]
+
+def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None, projection: dict = None):
+    """Get documents from collection, optionally restricted to the fields in projection"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
     
-    cursor = db[collection_name].find(filter_dict or {})
+    cursor = db[collection_name].find(filter_dict or {}, projection)
     if limit:
         cursor = cursor.limit(limit)
     
     return list(cursor)
+
+def get_document_by_id(collection_name: str, document_id: str, projection: dict = None):
+    """Get a single document by its _id (None if missing or not a valid ObjectId)"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    if not ObjectId.is_valid(document_id):
+        return None
+    return db[collection_name].find_one({"_id": ObjectId(document_id)}, projection)
@@ -1,17 +1,38 @@
+import io
+import math
+import multiprocessing
 import os
+import re
+import tempfile
+import threading
+import functools
+import operator
+import orjson
 from fastapi import FastAPI, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from typing import List, Optional, Dict, Any
+from fastapi.responses import JSONResponse, ORJSONResponse
+from typing import List, Optional, Dict, Any, BinaryIO, Iterable, Iterator, Union
 from pydantic import BaseModel
 from PyPDF2 import PdfReader
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dateutil import parser as dateparser
 from datetime import datetime, timedelta
 
-from database import create_document, get_documents, db
+from database import create_document, create_documents, get_documents, get_document_by_id, db
 from schemas import StudentResource, Summary, Note, Flashcard, StudyTask, StudyPlan, Doubt
+from pdf_workers import fitz, iter_pdf_pages, extract_page_range
 
-app = FastAPI(title="Student Productivity API")
+
+class MongoJSONResponse(ORJSONResponse):
+    """ORJSONResponse that stringifies values orjson can't encode natively, e.g. ObjectId."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+app = FastAPI(title="Student Productivity API", default_response_class=MongoJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,55 +45,260 @@ app.add_middleware(
 
 # ----------------------- Utility functions (simple heuristics) -----------------------
 
-def _extract_text_from_pdf(file_bytes: bytes) -> str:
+_SENT_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_LINE_SPLIT = re.compile(r"\n+")
+
+_SUMMARY_KW = frozenset({"important", "key", "therefore", "defines", "theorem", "proof", "exam", "result", "conclusion"})
+_NOTES_KW = frozenset({"definition", "formula", "step", "theorem", "law", "property", "example:"})
+_TASK_VERBS = frozenset({"submit", "finish", "complete", "read", "solve", "revise", "review", "write", "prepare"})
+_EXAM_WORDS = frozenset({"exam", "midterm", "final"})
+_PIVOT_WORDS = frozenset({"is", "are"})
+_IMAGE_EXTS = (".png", ".jpg", ".jpeg")
+_TASK_FIELDS = operator.itemgetter("title", "due_date", "priority")
+
+
+def _keyword_alternation(keywords) -> str:
+    # plain substring alternation (no word boundaries) to keep the old `k in s.lower()` semantics
+    return "|".join(map(re.escape, sorted(keywords)))
+
+
+def _keyword_re(keywords) -> re.Pattern:
+    return re.compile(_keyword_alternation(keywords), re.IGNORECASE)
+
+
+_SUMMARY_RE = _keyword_re(_SUMMARY_KW)
+_NOTES_RE = _keyword_re(_NOTES_KW)
+_EXAM_RE = _keyword_re(_EXAM_WORDS)
+# every line boundary str.splitlines() recognises, folded to "\n" so the MULTILINE
+# ^/$ in _TASK_LINE_RE split lines the same way
+_LINE_BREAKS = re.compile(r"\r\n?|[\x0b\x0c\x1c-\x1e\x85\u2028\u2029]")
+# whole lines mentioning a task verb, found in one scan over the text
+_TASK_LINE_RE = re.compile(r"^(?P<body>.*(?:" + _keyword_alternation(_TASK_VERBS) + r").*)$", re.IGNORECASE | re.MULTILINE)
+
+_MONTH = (
+    r"(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+    r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+)
+
+# Known date shapes tried before falling back to dateutil's fuzzy parser.
+# Groups are joined with spaces (month names cut to 3 letters) and fed to strptime.
+# Numeric forms are month-first to match dateutil's default; if strptime rejects a
+# match (e.g. 15/03/2025) the line still goes through dateutil.
+_DATE_RES = [
+    (re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b"), "%Y %m %d"),
+    (re.compile(r"\b(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})\b"), "%m %d %Y"),
+    (re.compile(r"\b(\d{1,2})[/.-](\d{1,2})[/.-](\d{2})\b"), "%m %d %y"),
+    (re.compile(r"\b" + _MONTH + r"\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})\b", re.IGNORECASE), "%b %d %Y"),
+    (re.compile(r"\b(\d{1,2})(?:st|nd|rd|th)?\s+" + _MONTH + r",?\s+(\d{4})\b", re.IGNORECASE), "%d %b %Y"),
+    (re.compile(r"\b" + _MONTH + r"\s+(\d{1,2})(?:st|nd|rd|th)?\b", re.IGNORECASE), "%b %d"),
+    (re.compile(r"\b(\d{1,2})(?:st|nd|rd|th)?\s+" + _MONTH + r"(?!\w)", re.IGNORECASE), "%d %b"),
+]
+
+
+# Lines with a time of day go straight to dateutil, which keeps the time; the
+# strptime fast path only knows dates and would store midnight.
+_TIME_RE = re.compile(r"\b\d{1,2}(?::\d{2})?\s*(?:am|pm)\b|\b\d{1,2}:\d{2}\b", re.IGNORECASE)
+
+
+def _match_known_date(line: str, default: datetime) -> Optional[datetime]:
+    if _TIME_RE.search(line):
+        return None
+    for pat, fmt in _DATE_RES:
+        m = pat.search(line)
+        if not m:
+            continue
+        try:
+            parsed = datetime.strptime(" ".join(g[:3] if g.isalpha() else g for g in m.groups()), fmt)
+            if "%Y" not in fmt and "%y" not in fmt:
+                parsed = parsed.replace(year=default.year)
+            return parsed
+        except ValueError:
+            continue
+    return None
+
+
+# longer lines are parsed uncached so the LRU can't pin arbitrarily large strings
+_DATE_CACHE_MAX_LINE = 256
+
+
+def _parse_date(s: str, default: datetime) -> Optional[datetime]:
     try:
-        import io
-        reader = PdfReader(io.BytesIO(file_bytes))
-        text_parts = []
-        for page in reader.pages:
-            try:
-                text_parts.append(page.extract_text() or "")
-            except Exception:
-                continue
-        return "\n".join(text_parts).strip()
+        parsed = _match_known_date(s, default) or dateparser.parse(s, fuzzy=True, default=default)
+    except Exception:
+        return None
+    if parsed is not None and parsed.tzinfo is not None:
+        # "10:00 UTC", "17:00 +0530": convert to naive local time so callers can
+        # compare with datetime.now()
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+_cached_parse_date = functools.lru_cache(maxsize=4096)(_parse_date)
+
+
+def _parse_due_date(line: str, default: datetime) -> Optional[datetime]:
+    # default is pinned to today's midnight by callers so cache keys stay stable within a day
+    if len(line) <= _DATE_CACHE_MAX_LINE:
+        return _cached_parse_date(line, default)
+    return _parse_date(line, default)
+
+
+# PDFs above this many pages are split into chunks extracted in worker processes
+_PDF_PARALLEL_MIN_PAGES = 50
+_PDF_CHUNK_PAGES = 64
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # spawn, not fork: the pool is created from a threadpool worker while the
+            # anyio and PyMongo threads are running
+            _pdf_pool = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
+        return _pdf_pool
+
+
+def _discard_pdf_pool(pool: ProcessPoolExecutor) -> None:
+    # drop a broken pool so the next _get_pdf_pool() builds a fresh one; another
+    # thread may already have replaced it
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is pool:
+            _pdf_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@app.on_event("shutdown")
+def _shutdown_pdf_pool():
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown()
+            _pdf_pool = None
+
+
+def _join_pages(pages: Iterable[str]) -> str:
+    # write pages into one buffer as they are produced instead of holding every
+    # page string in a list until a final join
+    out = io.StringIO()
+    for i, page in enumerate(pages):
+        if i:
+            out.write("\n")
+        out.write(page)
+    return out.getvalue().strip()
+
+
+def _iter_pypdf2_pages(reader: PdfReader) -> Iterator[str]:
+    for page in reader.pages:
+        try:
+            yield page.extract_text() or ""
+        except Exception:
+            continue
+
+
+def _extract_text_with_pypdf2(source: Union[bytes, BinaryIO]) -> str:
+    try:
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        source.seek(0)
+        return _join_pages(_iter_pypdf2_pages(PdfReader(source)))
     except Exception as e:
         return ""
 
 
-def _simple_summarize(text: str, max_sentences: int = 5) -> Dict[str, Any]:
-    import re
-    sentences = re.split(r"(?<=[.!?])\s+", text.strip())
-    sentences = [s.strip() for s in sentences if s.strip()]
-    key_points = []
-    for s in sentences:
-        if len(key_points) >= max_sentences:
-            break
-        # prefer sentences with key academic keywords
-        if any(k in s.lower() for k in ["important", "key", "therefore", "defines", "theorem", "proof", "exam", "result", "conclusion"]):
-            key_points.append(s)
-    if len(key_points) < max_sentences:
-        for s in sentences:
-            if s not in key_points:
-                key_points.append(s)
-            if len(key_points) >= max_sentences:
+def _extract_pdf_in_pool(file_bytes: bytes, page_count: int) -> str:
+    # pool workers reopen one named copy of the PDF by path instead of each
+    # receiving a pickled copy of the whole document
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp:
+        tmp.write(file_bytes)
+        tmp.flush()
+        for attempt in range(2):
+            pool = _get_pdf_pool()
+            try:
+                futures = [
+                    pool.submit(extract_page_range, tmp.name, start, min(start + _PDF_CHUNK_PAGES, page_count))
+                    for start in range(0, page_count, _PDF_CHUNK_PAGES)
+                ]
+                return _join_pages(f.result() for f in futures)
+            except BrokenProcessPool:
+                # a worker died (OOM, MuPDF crash): replace the pool so later uploads keep
+                # the parallel path, and retry this PDF once on the fresh pool
+                _discard_pdf_pool(pool)
+                if attempt:
+                    raise
+
+
+def _extract_text_from_pdf(source: Union[bytes, BinaryIO]) -> str:
+    """Extract text from PDF bytes or a seekable binary file (e.g. a spooled upload)."""
+    if fitz is None:
+        return _extract_text_with_pypdf2(source)
+    try:
+        if isinstance(source, bytes):
+            file_bytes = source
+        else:
+            # PyMuPDF only opens in-memory buffers or named files
+            source.seek(0)
+            file_bytes = source.read()
+        with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+            page_count = doc.page_count
+            if page_count <= _PDF_PARALLEL_MIN_PAGES:
+                return _join_pages(iter_pdf_pages(doc, 0, page_count))
+        return _extract_pdf_in_pool(file_bytes, page_count)
+    except Exception:
+        return _extract_text_with_pypdf2(source)
+
+
+# Sentences are stored next to content_text only below this size, so the copy
+# can't push a resource towards MongoDB's 16MB document limit
+_STORED_SENTENCES_MAX_CHARS = 1_000_000
+
+
+def _split_sentences(text: str) -> List[str]:
+    return _SENT_SPLIT.split(text.strip())
+
+
+def _sentences_to_store(text: str) -> Optional[List[str]]:
+    """Sentence split cached on a resource at ingest, or None if the text is too large."""
+    if len(text) > _STORED_SENTENCES_MAX_CHARS:
+        return None
+    return _split_sentences(text)
+
+
+def _simple_summarize(sentences: List[str], max_sentences: int = 5) -> Dict[str, Any]:
+    # single pass: prefer sentences with key academic keywords, keep the first
+    # other sentences as filler, stop once enough keyword sentences are found.
+    # Repeated keyword sentences are kept; only filler is deduplicated.
+    picked: List[str] = []
+    filler: List[str] = []
+    seen = set()
+    for s in (s.strip() for s in sentences):
+        if not s:
+            continue
+        if _SUMMARY_RE.search(s) is not None:
+            picked.append(s)
+            if len(picked) >= max_sentences:
                 break
-    summary_text = " ".join(key_points[:max_sentences])
+        elif len(filler) < max_sentences and s not in seen:
+            filler.append(s)
+            seen.add(s)
+    key_points = picked + filler[:max_sentences - len(picked)]
+    summary_text = " ".join(key_points)
     return {
         "content": summary_text,
-        "key_points": [p if len(p) <= 200 else p[:197] + "..." for p in key_points[:max_sentences]],
-        "reading_time_min": max(1, int(len(text.split()) / 180)),
+        "key_points": [p if len(p) <= 200 else p[:197] + "..." for p in key_points],
+        "reading_time_min": max(1, int(sum(len(s.split()) for s in sentences) / 180)),
     }
 
 
 def _make_exam_notes(text: str, max_points: int = 10) -> List[str]:
-    import re
-    lines = re.split(r"\n+", text)
     bullets = []
-    for line in lines:
+    for line in _LINE_SPLIT.split(text):
         line = line.strip(" -•\t")
         if not line:
             continue
-        if any(x in line.lower() for x in ["definition", "formula", "step", "theorem", "law", "property", "example:"]):
+        if _NOTES_RE.search(line) is not None:
             bullets.append(line)
         elif len(line.split()) <= 12:
             bullets.append(line)
@@ -80,31 +306,24 @@ def _make_exam_notes(text: str, max_points: int = 10) -> List[str]:
             break
     # fallback: first sentences
     if not bullets:
-        sentences = re.split(r"(?<=[.!?])\s+", text)
-        bullets = sentences[:max_points]
+        bullets = _split_sentences(text)[:max_points]
     return [b[:180] + ("..." if len(b) > 180 else "") for b in bullets]
 
 
-def _generate_flashcards(text: str, n: int = 8) -> List[Dict[str, str]]:
-    import re
-    sentences = re.split(r"(?<=[.!?])\s+", text)
+def _generate_flashcards(sentences: List[str], n: int = 8) -> List[Dict[str, str]]:
     cards = []
     for s in sentences:
         words = s.split()
-        if len(words) >= 6 and ("is" in words or "are" in words):
-            try:
-                if "is" in words:
-                    idx = words.index("is")
-                else:
-                    idx = words.index("are")
+        if len(words) >= 6:
+            # first "is"/"are" splits the sentence into subject and description
+            idx = next((i for i, w in enumerate(words) if w in _PIVOT_WORDS), -1)
+            if idx >= 0:
                 subject = " ".join(words[:idx]).strip(", .")
                 description = " ".join(words[idx+1:]).strip()
                 if subject and description:
                     q = f"What is {subject}?"
                     a = description
                     cards.append({"question": q[:180], "answer": a[:300]})
-            except Exception:
-                continue
         if len(cards) >= n:
             break
     # fallback generic
@@ -120,26 +339,24 @@ def _generate_flashcards(text: str, n: int = 8) -> List[Dict[str, str]]:
 def _extract_tasks_and_deadlines(text: str) -> List[Dict[str, Any]]:
     # simple heuristic: look for lines with verbs and dates
     tasks: List[Dict[str, Any]] = []
-    for line in text.splitlines():
-        l = line.strip()
-        if not l:
-            continue
-        lower = l.lower()
-        if any(v in lower for v in ["submit", "finish", "complete", "read", "solve", "revise", "review", "write", "prepare"]):
-            due = None
-            try:
-                due = dateparser.parse(l, fuzzy=True, default=datetime.now())
-                # Only keep if parsed date is in the future-ish
-                if due < datetime.now() - timedelta(days=1):
-                    due = None
-            except Exception:
+    now = datetime.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    cutoff = now - timedelta(days=1)
+    for m in _TASK_LINE_RE.finditer(_LINE_BREAKS.sub("\n", text)):
+        l = m.group("body").strip()
+        due = None
+        # no digits means no date worth parsing; skip dateutil entirely
+        if any(c.isdigit() for c in l):
+            due = _parse_due_date(l, today)
+            # Only keep if parsed date is in the future-ish
+            if due is not None and due < cutoff:
                 due = None
-            tasks.append({
-                "title": l[:120],
-                "due_date": due.isoformat() if due else None,
-                "status": "todo",
-                "priority": "high" if any(p in lower for p in ["exam", "midterm", "final"]) else "medium",
-            })
+        tasks.append({
+            "title": l[:120],
+            "due_date": due,
+            "status": "todo",
+            "priority": "high" if _EXAM_RE.search(l) is not None else "medium",
+        })
     return tasks
 
 
@@ -184,13 +401,22 @@ def test_database():
 
 @app.post("/api/resources/upload")
 async def upload_resource(file: UploadFile = File(...), title: Optional[str] = Form(None)):
-    data = await file.read()
+    # Starlette has already spooled the upload to a SpooledTemporaryFile (on disk past
+    # 1MB) and counted its bytes; only PDFs are ever read back from it.
+    filename = file.filename.lower()
+    size = file.size
+    if size is None:
+        file.file.seek(0, io.SEEK_END)
+        size = file.file.tell()
     content_text = ""
+    sentences: Optional[List[str]] = None
     rtype = "unknown"
-    if file.filename.lower().endswith(".pdf"):
+    if filename.endswith(".pdf"):
         rtype = "pdf"
-        content_text = _extract_text_from_pdf(data)
-    elif any(file.filename.lower().endswith(ext) for ext in [".png", ".jpg", ".jpeg"]):
+        # large PDFs fan out to the process pool from inside the worker thread
+        content_text = await run_in_threadpool(_extract_text_from_pdf, file.file)
+        sentences = await run_in_threadpool(_sentences_to_store, content_text)
+    elif filename.endswith(_IMAGE_EXTS):
         rtype = "image"
         # OCR not included in this demo environment
         content_text = ""
@@ -202,7 +428,8 @@ async def upload_resource(file: UploadFile = File(...), title: Optional[str] = F
         type=rtype,
         source_name=file.filename,
         content_text=content_text,
-        metadata={"size": len(data)}
+        sentences=sentences,
+        metadata={"size": size}
     )
     rid = create_document("studentresource", doc)
     return {"resource_id": rid, "detected_type": rtype, "chars": len(content_text)}
@@ -210,11 +437,13 @@ async def upload_resource(file: UploadFile = File(...), title: Optional[str] = F
 
 @app.post("/api/resources/text")
 async def create_text_resource(payload: TextIn):
+    sentences = await run_in_threadpool(_sentences_to_store, payload.text)
     doc = StudentResource(
         title=payload.title,
         type="text",
         source_name=None,
         content_text=payload.text,
+        sentences=sentences,
         metadata={}
     )
     rid = create_document("studentresource", doc)
@@ -223,22 +452,31 @@ async def create_text_resource(payload: TextIn):
 
 # ----------------------- Generators -----------------------
 
+def _load_text(payload: GenerateIn) -> str:
+    """Inline text, or the content_text of the referenced resource."""
+    if payload.text or not payload.resource_id:
+        return payload.text or ""
+    resource = get_document_by_id("studentresource", payload.resource_id, {"content_text": 1}) or {}
+    return resource.get("content_text") or ""
+
+
+def _load_sentences(payload: GenerateIn) -> List[str]:
+    """Sentences of the inline text, or the ones cached on the referenced resource."""
+    if payload.text or not payload.resource_id:
+        return _split_sentences(payload.text or "")
+    resource = get_document_by_id("studentresource", payload.resource_id, {"sentences": 1})
+    if resource is None:
+        return _split_sentences("")
+    if resource.get("sentences") is None:
+        # too large to cache at ingest, or stored before sentences were cached
+        return _split_sentences(_load_text(payload))
+    return resource["sentences"]
+
+
 @app.post("/api/summarize")
 async def summarize(payload: GenerateIn):
-    text = payload.text
-    if not text and payload.resource_id:
-        items = get_documents("studentresource", {"_id": {"$eq": db.studentresource._ObjectId(payload.resource_id) if False else None}})
-        # Fallback since we can't easily ObjectId with helper; fetch by scanning
-        if not items:
-            items = get_documents("studentresource")
-            for it in items:
-                if str(it.get("_id")) == str(payload.resource_id):
-                    text = it.get("content_text", "")
-                    break
-        else:
-            text = items[0].get("content_text", "")
-    text = text or ""
-    result = _simple_summarize(text)
+    sentences = await run_in_threadpool(_load_sentences, payload)
+    result = await run_in_threadpool(_simple_summarize, sentences)
     summ = Summary(title="Summary", resource_id=payload.resource_id, content=result["content"], key_points=result["key_points"], reading_time_min=result["reading_time_min"]) 
     sid = create_document("summary", summ)
     return {"summary_id": sid, **result}
@@ -246,8 +484,8 @@ async def summarize(payload: GenerateIn):
 
 @app.post("/api/notes")
 async def notes(payload: GenerateIn):
-    text = payload.text or ""
-    bullets = _make_exam_notes(text)
+    text = await run_in_threadpool(_load_text, payload)
+    bullets = await run_in_threadpool(_make_exam_notes, text)
     note = Note(title="Exam-focused Notes", resource_id=payload.resource_id, bullets=bullets)
     nid = create_document("note", note)
     return {"note_id": nid, "bullets": bullets}
@@ -255,48 +493,46 @@ async def notes(payload: GenerateIn):
 
 @app.post("/api/flashcards")
 async def flashcards(payload: GenerateIn):
-    text = payload.text or ""
-    cards = _generate_flashcards(text, n=payload.count or 8)
-    created_ids: List[str] = []
-    for c in cards:
-        fc = Flashcard(resource_id=payload.resource_id, question=c["question"], answer=c["answer"], topic=None)
-        cid = create_document("flashcard", fc)
-        created_ids.append(cid)
+    sentences = await run_in_threadpool(_load_sentences, payload)
+    cards = await run_in_threadpool(_generate_flashcards, sentences, n=payload.count or 8)
+    fc_docs = [Flashcard(resource_id=payload.resource_id, question=c["question"], answer=c["answer"], topic=None) for c in cards]
+    created_ids = create_documents("flashcard", fc_docs)
     return {"count": len(cards), "cards": cards, "ids": created_ids}
 
 
 @app.post("/api/tasks/extract")
 async def extract_tasks(payload: GenerateIn):
     text = payload.text or ""
-    tasks = _extract_tasks_and_deadlines(text)
-    created: List[Dict[str, Any]] = []
-    for t in tasks:
-        task = StudyTask(title=t["title"], due_date=dateparser.parse(t["due_date"]) if t.get("due_date") else None, course=None, source="extracted", status="todo", priority=t.get("priority", "medium"))
-        tid = create_document("studytask", task)
-        t["id"] = tid
-        created.append(t)
+    tasks = await run_in_threadpool(_extract_tasks_and_deadlines, text)
+    task_docs = [
+        StudyTask(title=title, due_date=due, course=None, source="extracted", status="todo", priority=priority)
+        for title, due, priority in map(_TASK_FIELDS, tasks)
+    ]
+    # due dates stay datetimes until here; serialize only for the response
+    created = [
+        {**t, "due_date": t["due_date"].isoformat() if t["due_date"] else None, "id": tid}
+        for t, tid in zip(tasks, create_documents("studytask", task_docs))
+    ]
     return {"tasks": created}
 
 
 @app.post("/api/plan")
 async def plan(payload: PlanIn):
-    # naive schedule: split objectives across days and allocate sessions
-    tasks: List[Dict[str, Any]] = []
+    # naive schedule: spread objectives evenly across days, per_day at a time
     if not payload.objectives:
         payload.objectives = ["Review notes", "Practice problems", "Revise key formulas"]
-    per_day = max(1, int(len(payload.objectives) / max(1, payload.days)) )
-    day_pointer = 0
+    days = max(1, payload.days)
+    per_day = math.ceil(len(payload.objectives) / days)
     start = datetime.now().date()
-    for i, obj in enumerate(payload.objectives):
-        due = start + timedelta(days=min(day_pointer, payload.days - 1))
-        tasks.append({
+    tasks: List[Dict[str, Any]] = [
+        {
             "title": f"{obj}",
-            "due_date": due.isoformat(),
+            "due_date": (start + timedelta(days=min(i // per_day, days - 1))).isoformat(),
             "status": "todo",
             "priority": "medium",
-        })
-        if (i + 1) % per_day == 0:
-            day_pointer += 1
+        }
+        for i, obj in enumerate(payload.objectives)
+    ]
     plan_doc = StudyPlan(title=payload.title, objectives=payload.objectives, tasks=tasks, timeframe_days=payload.days)
     pid = create_document("studyplan", plan_doc)
     return {"plan_id": pid, "tasks": tasks, "days": payload.days}
@@ -323,38 +559,27 @@ async def doubts(payload: DoubtIn):
 @app.get("/api/flashcards")
 async def list_flashcards(limit: int = 20):
     items = get_documents("flashcard", {}, limit)
-    # Serialize ObjectIds
-    for it in items:
-        if "_id" in it:
-            it["_id"] = str(it["_id"])
-    return {"items": items}
+    # returned directly so ObjectIds are stringified by orjson, skipping jsonable_encoder
+    return MongoJSONResponse({"items": items})
 
 
 @app.get("/api/tasks")
 async def list_tasks(limit: int = 50):
     items = get_documents("studytask", {}, limit)
-    for it in items:
-        if "_id" in it:
-            it["_id"] = str(it["_id"])
-    return {"items": items}
+    return MongoJSONResponse({"items": items})
 
 
 @app.get("/api/summaries")
 async def list_summaries(limit: int = 20):
-    items = get_documents("summary", {}, limit)
-    for it in items:
-        if "_id" in it:
-            it["_id"] = str(it["_id"])
-    return {"items": items}
+    # the full summary text is only needed when a summary is opened, not for listing
+    items = get_documents("summary", {}, limit, projection={"content": 0})
+    return MongoJSONResponse({"items": items})
 
 
 @app.get("/api/notes")
 async def list_notes(limit: int = 20):
     items = get_documents("note", {}, limit)
-    for it in items:
-        if "_id" in it:
-            it["_id"] = str(it["_id"])
-    return {"items": items}
+    return MongoJSONResponse({"items": items})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,29 @@
+"""
+PDF Page Extraction Workers
+
+Functions run by the process pool that extracts large PDFs in page chunks.
+This module deliberately imports nothing from the app, so worker processes
+don't build the FastAPI app or open a MongoDB client.
+"""
+
+from typing import Iterator
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:  # callers fall back to PyPDF2
+    fitz = None
+
+
+def iter_pdf_pages(doc, start: int, stop: int) -> Iterator[str]:
+    """Yield the text of pages [start, stop), skipping pages that fail to extract"""
+    for i in range(start, stop):
+        try:
+            yield doc[i].get_text("text") or ""
+        except Exception:
+            continue
+
+
+def extract_page_range(path: str, start: int, stop: int) -> str:
+    """Open the PDF at path and return the text of pages [start, stop)"""
+    with fitz.open(path) as doc:
+        return "\n".join(iter_pdf_pages(doc, start, stop))
@@ -17,6 +17,7 @@ class StudentResource(BaseModel):
     type: str = Field(..., description="pdf | audio | image | text")
     source_name: Optional[str] = Field(None, description="Original filename if any")
     content_text: Optional[str] = Field(None, description="Extracted/plain text content")
+    sentences: Optional[List[str]] = Field(None, description="content_text split into sentences at ingest (omitted for very large texts)")
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 class Summary(BaseModel):